@@ -1,9 +1,13 @@
 import streamlit as st
 import joblib
-import pandas as pd
-import plotly.express as px
-import time
+import csv
+import io
+import numpy as np
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from types import MappingProxyType
+from features import GENDERS, EDUCATION_LEVELS, JOB_TITLES, NUMERIC_FEATURES, CATEGORICAL_FEATURES
 
 
 # ---------- PAGE CONFIG ----------
@@ -16,7 +20,9 @@ st.set_page_config(
 
 
 # ---------- STYLING ----------
-st.markdown("""<style>
+# Streamlit drops any element a full rerun does not emit again, so the styles can't be
+# written once per session; they go out with the header as a single markdown element
+PAGE_HEADER = """<style>
     body { font-family: 'Inter', sans-serif; }
     .main-header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
     padding: 2rem; border-radius: 15px; margin-bottom: 2rem;
@@ -25,13 +31,72 @@ st.markdown("""<style>
     .prediction-card { background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%);
     padding: 2rem; border-radius: 15px; text-align: center; }
     .prediction-amount { font-size: 2.5rem; font-weight: 700; color: white; margin: 1rem 0; }
-</style>""", unsafe_allow_html=True)
+</style>
+<div class="main-header"><h1>💼Employee Salary Predictor</h1></div>"""
 
 
 # ---------- MODEL ----------
+# Scalar form of the trained pipeline, so a single prediction skips the sklearn dispatch
+class Predictor(namedtuple("Predictor", [
+    "intercept", "num_coef", "gender_coef", "education_coef", "job_coef"
+])):
+    __slots__ = ()
+
+    def predict(self, age, gender, education_level, job_title, experience):
+        return (
+            self.intercept
+            + self.num_coef[0] * age
+            + self.num_coef[1] * experience
+            + self.gender_coef.get(gender, 0.0)
+            + self.education_coef.get(education_level, 0.0)
+            + self.job_coef.get(job_title, 0.0)
+        )
+
+
+def build_predictor(pipeline):
+    regressor = pipeline.named_steps["regressor"]
+
+    # Column layout of features.encode: the raw numerics, then one one-hot block per categorical feature
+    # Tuples and read-only mappings, since one Predictor is shared by every session
+    coef = tuple(regressor.coef_.tolist())
+    num_coef, offset = coef[:len(NUMERIC_FEATURES)], len(NUMERIC_FEATURES)
+    category_coefs = []
+    for _, categories in CATEGORICAL_FEATURES:
+        block = coef[offset:offset + len(categories)]
+        category_coefs.append(MappingProxyType(dict(zip(categories, block))))
+        offset += len(categories)
+
+    return Predictor(float(regressor.intercept_), num_coef, *category_coefs)
+
+
+def load_predictor():
+    return build_predictor(joblib.load("salary_prediction_pipeline.pkl"))
+
+
+# Streamlit re-executes this script on every rerun, so the background load is
+# started from a cached function to make sure it is only submitted once
+@st.cache_resource
+def start_model_load():
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(load_predictor)
+    executor.shutdown(wait=False)
+    return future
+
+
+# The Predictor is immutable, so one instance is shared by every session; the
+# pipeline it was extracted from is dropped as soon as the worker thread finishes
 @st.cache_resource
-def load_model():
-    return joblib.load("salary_prediction_pipeline.pkl")
+def get_predictor():
+    future = start_model_load()
+    if future.exception() is not None:
+        # Don't keep a failed load cached; the next run starts a fresh one
+        start_model_load.clear()
+    return future.result()
+
+
+@st.cache_data
+def predict_salary(age, gender, education_level, job_title, experience):
+    return float(get_predictor().predict(age, gender, education_level, job_title, experience))
 
 
 # ---------- VALIDATION ----------
@@ -47,12 +112,160 @@ def validate_experience(experience, age):
     return True, ""
 
 
+# ---------- CHARTS ----------
+# (Job Role, Years of Experience, Actual Salary (INR)) baseline points
+_SCATTER_BASE = (
+    ("Developer", 3, 800000),
+    ("Data Scientist", 5, 1200000),
+    ("Manager", 10, 1500000),
+    ("Analyst", 2, 700000),
+    ("Engineer", 4, 900000),
+)
+
+_ROLE_DIST = {
+    "Role": ["Developer", "Data Scientist", "Manager", "Analyst", "Engineer"],
+    "Count": [50, 20, 15, 10, 5]
+}
+
+
+# Only a scatter with a trace larger than the number of points plotly-resampler would
+# show gets wrapped, so small charts stay plain go.Figures and skip its import
+_RESAMPLE_THRESHOLD = 1000
+
+
+def _trace_size(trace):
+    # Not every trace type has x (a Pie doesn't), and x may be a numpy array
+    x = getattr(trace, "x", None)
+    return 0 if x is None else len(x)
+
+
+def resample_scatter_if_large(fig):
+    if max(map(_trace_size, fig.data), default=0) <= _RESAMPLE_THRESHOLD:
+        return fig
+    from plotly_resampler import FigureResampler
+
+    return FigureResampler(fig, default_n_shown_samples=_RESAMPLE_THRESHOLD)
+
+
+# Input-independent, so built once per process and shared by every session; plain
+# graph_objects avoid plotly.express and the pandas import it brings along
+@st.cache_resource
+def build_pie_fig():
+    import plotly.graph_objects as go
+    from plotly.colors import sequential
+
+    fig = go.Figure(go.Pie(
+        labels=_ROLE_DIST["Role"],
+        values=_ROLE_DIST["Count"],
+        marker=dict(colors=sequential.RdBu)
+    ))
+    fig.update_layout(title="Job Role Distribution")
+    return fig
+
+
+# ---------- PREDICTION ----------
+# Runs as a fragment so clicking Predict only reruns this section, not the whole page
+@st.fragment
+def prediction_section(inputs_valid, age, gender, education_level, job_title, experience, currency, show_charts):
+    inputs = (age, gender, education_level, job_title, experience)
+    # Re-assigning the toggle keys every run stops Streamlit from dropping their state while
+    # the toggles are not rendered, so charts start off and keep the user's choice after that
+    for key in ("scatter_open", "pie_open"):
+        st.session_state[key] = st.session_state.get(key, False)
+
+    if st.button("🔮 Predict My Salary", use_container_width=True):
+        if inputs_valid:
+            st.session_state["predicted_inputs"] = inputs
+        else:
+            st.error("❌ Please fix the validation errors above before predicting.")
+
+    # The result stays up across fragment reruns (chart toggles, download) until the inputs change
+    if not inputs_valid or st.session_state.get("predicted_inputs") != inputs:
+        return
+
+    with st.spinner("Analyzing your profile..."):
+        prediction = predict_salary(age, gender, education_level, job_title, experience)
+
+        currency_multipliers = {
+            "₹ (INR)": 1,
+            "$ (USD)": 0.012,
+            "€ (EUR)": 0.011,
+        }
+        symbol = currency.split()[0]
+        converted_salary = prediction * currency_multipliers[currency]
+
+        st.markdown(f"""
+            <div class="prediction-card"><p>💰 Predicted Annual Salary</p>
+            <div class="prediction-amount">{symbol} {converted_salary:,.2f}</div></div>""",
+            unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Monthly Salary", f"{symbol} {converted_salary / 12:,.2f}")
+        col2.metric("Hourly Rate", f"{symbol} {converted_salary / (40 * 52):.2f}")
+        col3.metric("Daily Earning", f"{symbol} {converted_salary / 365:.2f}")
+
+        # ----- VISUALIZATIONS -----
+        # Each chart is only built and sent once its toggle is switched on
+        if show_charts:
+            # SCATTER PLOT: Years of Experience vs Actual Salary
+            if st.toggle("📊 Actual vs. Predicted Salary (Scatter Plot)", key="scatter_open"):
+                # Imported here so a page that never shows a chart doesn't pay for plotly
+                import plotly.graph_objects as go
+
+                fig = go.Figure()
+                for role, years, salary in _SCATTER_BASE:
+                    fig.add_trace(go.Scattergl(
+                        x=np.array([years]), y=np.array([salary]), mode="markers", name=role,
+                        marker=dict(size=10, line=dict(width=2, color='DarkSlateGrey'))
+                    ))
+                fig.add_trace(go.Scattergl(
+                    x=np.array([experience]), y=np.array([prediction]), mode="markers", name="You",
+                    marker=dict(size=14, line=dict(width=2, color='DarkSlateGrey'))
+                ))
+                fig.update_layout(
+                    title="Actual vs Predicted Salary (INR)",
+                    xaxis_title="Years of Experience",
+                    yaxis_title="Actual Salary (INR)"
+                )
+                st.plotly_chart(resample_scatter_if_large(fig), use_container_width=True)
+
+            # PIE CHART: Role Distribution
+            if st.toggle("📊 Job Role Distribution (Pie Chart)", key="pie_open"):
+                st.plotly_chart(build_pie_fig(), use_container_width=True)
+
+        # ----- DOWNLOAD REPORT -----
+        # One timestamp for both the report and its file name, so they can't disagree
+        predicted_at = datetime.now()
+        result_data = {
+            "Prediction_Date": predicted_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "Age": age,
+            "Gender": gender,
+            "Education": education_level,
+            "Job_Title": job_title,
+            "Experience": experience,
+            "Predicted_Salary": prediction,
+            "Currency": currency,
+            "Converted_Salary": converted_salary
+        }
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(result_data.keys())
+        writer.writerow(result_data.values())
+        st.download_button(
+            label="📥 Download Prediction Report",
+            data=buffer.getvalue(),
+            file_name=f"salary_prediction_{predicted_at.strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+        st.success("✅ Prediction completed!")
+
+
 # ---------- MAIN FUNCTION ----------
 def main():
-    model = load_model()
+    start_model_load()
 
     # ----- HEADER -----
-    st.markdown("""<div class="main-header"><h1>💼Employee Salary Predictor</h1></div>""", unsafe_allow_html=True)
+    st.markdown(PAGE_HEADER, unsafe_allow_html=True)
 
     # ----- PREDICTION SETTINGS AT TOP -----
     st.subheader("Prediction Settings")
@@ -66,9 +279,9 @@ def main():
     col1, col2 = st.columns([2, 1])
     with col1:
         age = st.number_input("Age", min_value=18, max_value=100, value=30)
-        gender = st.selectbox("Gender", ("Male", "Female"))
-        education_level = st.selectbox("Education Level", ["High School", "Bachelor", "Master", "PhD"], index=1)
-        job_title = st.selectbox("Job Title", ["Developer", "Data Scientist", "Manager", "Analyst", "Engineer"])
+        gender = st.selectbox("Gender", GENDERS)
+        education_level = st.selectbox("Education Level", EDUCATION_LEVELS, index=1)
+        job_title = st.selectbox("Job Title", JOB_TITLES)
         experience = st.slider("Years of Experience", min_value=0, max_value=50, value=5)
 
     with col2:
@@ -82,106 +295,8 @@ def main():
     st.markdown("---")
 
     # ----- PREDICT -----
-    if st.button("🔮 Predict My Salary", use_container_width=True):
-        if not (age_valid and exp_valid):
-            st.error("❌ Please fix the validation errors above before predicting.")
-        else:
-            with st.spinner("Analyzing your profile..."):
-                time.sleep(1)
-
-                input_df = pd.DataFrame({
-                    "Age": [age],
-                    "Gender": [gender],
-                    "Education Level": [education_level],
-                    "Job Title": [job_title],
-                    "Years of Experience": [experience]
-                })
-
-                prediction = model.predict(input_df)[0]
-
-                currency_multipliers = {
-                    "₹ (INR)": 1,
-                    "$ (USD)": 0.012,
-                    "€ (EUR)": 0.011,
-                }
-                symbol = currency.split()[0]
-                converted_salary = prediction * currency_multipliers[currency]
-
-                st.markdown(f"""
-                    <div class="prediction-card"><p>💰 Predicted Annual Salary</p>
-                    <div class="prediction-amount">{symbol} {converted_salary:,.2f}</div></div>""",
-                    unsafe_allow_html=True)
-
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Monthly Salary", f"{symbol} {converted_salary / 12:,.2f}")
-                col2.metric("Hourly Rate", f"{symbol} {converted_salary / (40 * 52):.2f}")
-                col3.metric("Daily Earning", f"{symbol} {converted_salary / 365:.2f}")
-
-                # ----- VISUALIZATIONS -----
-                if show_charts:
-                    # SCATTER PLOT: Years of Experience vs Actual Salary
-                    st.markdown("### 📊 Actual vs. Predicted Salary (Scatter Plot)")
-                    scatter_data = pd.DataFrame({
-                        "Job Role": ["Developer", "Data Scientist", "Manager", "Analyst", "Engineer"],
-                        "Actual Salary (INR)": [800000, 1200000, 1500000, 700000, 900000],
-                        "Years of Experience": [3, 5, 10, 2, 4]
-                    })
-
-                    scatter_data.loc[len(scatter_data)] = {
-                        "Job Role": "You",
-                        "Actual Salary (INR)": prediction,
-                        "Years of Experience": experience
-                    }
-
-                    fig = px.scatter(
-                        scatter_data,
-                        x="Years of Experience",
-                        y="Actual Salary (INR)",
-                        color="Job Role",
-                        title="Actual vs Predicted Salary (INR)",
-                        size=[10] * len(scatter_data),
-                        hover_data=["Job Role"]
-                    )
-
-                    fig.update_traces(marker=dict(line=dict(width=2, color='DarkSlateGrey')))
-                    st.plotly_chart(fig, use_container_width=True)
-
-                    # PIE CHART: Role Distribution
-                    st.markdown("### 📊 Job Role Distribution (Pie Chart)")
-                    role_distribution = pd.DataFrame({
-                        "Role": ["Developer", "Data Scientist", "Manager", "Analyst", "Engineer"],
-                        "Count": [50, 20, 15, 10, 5]
-                    })
-                    pie_fig = px.pie(
-                        role_distribution,
-                        names="Role",
-                        values="Count",
-                        title="Job Role Distribution",
-                        color_discrete_sequence=px.colors.sequential.RdBu
-                    )
-                    st.plotly_chart(pie_fig, use_container_width=True)
-
-                # ----- DOWNLOAD REPORT -----
-                result_data = {
-                    "Prediction_Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "Age": age,
-                    "Gender": gender,
-                    "Education": education_level,
-                    "Job_Title": job_title,
-                    "Experience": experience,
-                    "Predicted_Salary": prediction,
-                    "Currency": currency,
-                    "Converted_Salary": converted_salary
-                }
-                result_df = pd.DataFrame([result_data])
-                csv = result_df.to_csv(index=False)
-                st.download_button(
-                    label="📥 Download Prediction Report",
-                    data=csv,
-                    file_name=f"salary_prediction_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-                st.success("✅ Prediction completed!")
+    prediction_section(age_valid and exp_valid, age, gender, education_level, job_title, experience,
+                       currency, show_charts)
 
 
 # ---------- EXECUTE ----------
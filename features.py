@@ -0,0 +1,32 @@
+import numpy as np
+
+
+# ---------- FIXED SCHEMA ----------
+# Same vocabularies, in the same order, as the app's selectboxes
+GENDERS = ["Male", "Female"]
+EDUCATION_LEVELS = ["High School", "Bachelor", "Master", "PhD"]
+JOB_TITLES = ["Developer", "Data Scientist", "Manager", "Analyst", "Engineer"]
+
+NUMERIC_FEATURES = ["Age", "Years of Experience"]
+CATEGORICAL_FEATURES = [
+    ("Gender", GENDERS),
+    ("Education Level", EDUCATION_LEVELS),
+    ("Job Title", JOB_TITLES)
+]
+
+
+# ---------- ENCODER ----------
+def one_hot(values, categories):
+    # Imported here so the app can read the vocabularies above without loading pandas
+    import pandas as pd
+
+    # The extra all-zero last row is what code -1 (an unknown category) picks
+    codes = pd.Categorical(values, categories=categories).codes
+    return np.eye(len(categories) + 1, len(categories))[codes]
+
+
+def encode(df):
+    return np.hstack(
+        [df[NUMERIC_FEATURES].to_numpy(dtype=np.float64)]
+        + [one_hot(df[column], categories) for column, categories in CATEGORICAL_FEATURES]
+    )
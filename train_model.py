@@ -1,57 +1,42 @@
 import pandas as pd
 import numpy as np
 from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.preprocessing import FunctionTransformer
 from sklearn.linear_model import LinearRegression
 import joblib
+from features import GENDERS, EDUCATION_LEVELS, JOB_TITLES, encode
+
+# Seeded generator so every run produces the same dataset and model
+rng = np.random.default_rng(0)
+
 # 1️⃣ Create a dummy dataset matching your app inputs
 data = pd.DataFrame({
-    "Age": np.random.randint(22, 60, 300),
-    "Gender": np.random.choice(["Male", "Female"], 300),
-    "Education Level": np.random.choice(["High School", "Bachelor", "Master", "PhD"], 300),
-    "Job Title": np.random.choice(["Developer", "Data Scientist", "Manager", "Analyst", "Engineer"], 300),
-    "Years of Experience": np.random.randint(0, 35, 300)
+    "Age": rng.integers(22, 60, 300),
+    "Gender": rng.choice(GENDERS, 300),
+    "Education Level": rng.choice(EDUCATION_LEVELS, 300),
+    "Job Title": rng.choice(JOB_TITLES, 300),
+    "Years of Experience": rng.integers(0, 35, 300)
 })
 
 # Fake salary logic: purely for demo
 base_salary = 250000
-data["Salary"] = (
-    base_salary
-    + data["Age"] * 3000
-    + data["Years of Experience"] * 15000
-    + data["Education Level"].map({
-        "High School": 0,
-        "Bachelor": 50000,
-        "Master": 100000,
-        "PhD": 200000
-    })
-    + data["Job Title"].map({
-        "Developer": 200000,
-        "Data Scientist": 400000,
-        "Manager": 500000,
-        "Analyst": 150000,
-        "Engineer": 250000
-    })
-    + np.random.normal(0, 50000, 300)
-)
+education_bonus = np.array([0, 50000, 100000, 200000])
+job_bonus = np.array([200000, 400000, 500000, 150000, 250000])
+
+# Accumulate into one array in place instead of chaining Series additions
+salary = np.full(300, base_salary, dtype=np.float64)
+salary += data["Age"].to_numpy() * 3000
+salary += data["Years of Experience"].to_numpy() * 15000
+salary += np.take(education_bonus, pd.Categorical(data["Education Level"], categories=EDUCATION_LEVELS).codes)
+salary += np.take(job_bonus, pd.Categorical(data["Job Title"], categories=JOB_TITLES).codes)
+salary += rng.normal(0, 50000, 300)
+data["Salary"] = salary
 
 # 2️⃣ Preprocessing pipeline
-numeric_features = ["Age", "Years of Experience"]
-numeric_transformer = StandardScaler()
-
-categorical_features = ["Gender", "Education Level", "Job Title"]
-categorical_transformer = OneHotEncoder(handle_unknown='ignore')
-
-preprocessor = ColumnTransformer(
-    transformers=[
-        ('num', numeric_transformer, numeric_features),
-        ('cat', categorical_transformer, categorical_features)
-    ]
-)
-
+# The vocabularies are fixed, so a stateless numpy encoder replaces ColumnTransformer +
+# OneHotEncoder; numerics stay unscaled since plain least squares is scale-invariant
 pipeline = Pipeline(steps=[
-    ('preprocessor', preprocessor),
+    ('preprocessor', FunctionTransformer(encode)),
     ('regressor', LinearRegression())
 ])
 
@@ -61,7 +46,12 @@ y = data["Salary"]
 
 pipeline.fit(X, y)
 
+# Store the coefficients as float32: half the bytes, and plenty of precision for a demo model
+regressor = pipeline.named_steps['regressor']
+regressor.coef_ = regressor.coef_.astype(np.float32)
+regressor.intercept_ = regressor.intercept_.astype(np.float32)
+
 # 4️⃣ Save model as `salary_prediction_pipeline.pkl`
-joblib.dump(pipeline, "salary_prediction_pipeline.pkl")
+joblib.dump(pipeline, "salary_prediction_pipeline.pkl", compress=3)
 
 print("✅ Model trained and saved as 'salary_prediction_pipeline.pkl'")